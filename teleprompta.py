@@ -3,58 +3,10 @@ from tkinter import ttk, colorchooser, font, messagebox, filedialog
 import json
 import os
 
-SETTINGS_FILE = "teleprompta_settings.json"
-DEFAULT_TEXT = "Welcome to Teleprompta!\n\nHighlight text and apply a style preset from the toolbar above."
-
-DEFAULT_STYLE_PRESETS = [
-    {"name": "Body", "font": "Arial", "size": 24, "color": "#AAAAAA"},
-    {"name": "Title", "font": "Arial Black", "size": 28, "color": "#000000"},
-    {"name": "Tips", "font": "Arial", "size": 20, "color": "#2196F3"},
-]
-
-DEFAULT_BG_COLOR = "#222222"
-DEFAULT_BG_ALPHA = 0.85
-DEFAULT_MENUBAR_COLOR = "#111111"
-
-DEFAULT_SWATCHES = [
-    ["#AAAAAA", "#FFFFFF", "#000000", "#FF4444", "#2196F3", "#00E5FF"],
-    ["#000000", "#4CAF50", "#FFEB3B", "#FF9800", "#9C27B0", "#F44336"],
-    ["#2196F3", "#4CAF50", "#FFEB3B", "#FF4444", "#9C27B0", "#00E5FF"]
-]
-DEFAULT_BG_SWATCHES = ["#222222", "#111111", "#444444", "#2196F3", "#4CAF50", "#FFEB3B"]
-DEFAULT_MENUBAR_SWATCHES = ["#111111", "#222222", "#333333", "#444444", "#FFFFFF", "#000000"]
-
-def load_settings():
-    defaults = {
-        "text": DEFAULT_TEXT,
-        "styles": DEFAULT_STYLE_PRESETS,
-        "bg_color": DEFAULT_BG_COLOR,
-        "bg_alpha": DEFAULT_BG_ALPHA,
-        "menubar_color": DEFAULT_MENUBAR_COLOR,
-        "swatches": DEFAULT_SWATCHES,
-        "bg_swatches": DEFAULT_BG_SWATCHES,
-        "menubar_swatches": DEFAULT_MENUBAR_SWATCHES,
-        "last_script": None
-    }
-    if not os.path.exists(SETTINGS_FILE):
-        return defaults
-    try:
-        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        for key, value in defaults.items():
-            if key not in data:
-                data[key] = value
-        while len(data["styles"]) < 3:
-            data["styles"].append(DEFAULT_STYLE_PRESETS[len(data["styles"])])
-        while len(data["swatches"]) < 3:
-            data["swatches"].append(DEFAULT_SWATCHES[len(data["swatches"])])
-        while len(data["bg_swatches"]) < 6:
-            data["bg_swatches"].append(DEFAULT_BG_SWATCHES[len(data["bg_swatches"])])
-        while len(data["menubar_swatches"]) < 6:
-            data["menubar_swatches"].append(DEFAULT_MENUBAR_SWATCHES[len(data["menubar_swatches"])])
-        return data
-    except Exception:
-        return defaults
+from teleprompta_config import (
+    SETTINGS_FILE, DEFAULT_MENUBAR_COLOR, DEFAULT_SWATCHES, DEFAULT_BG_SWATCHES,
+    DEFAULT_MENUBAR_SWATCHES, load_settings
+)
 
 def save_settings(settings):
     try:
@@ -0,0 +1,307 @@
+import argparse
+import bisect
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = ImageDraw = ImageFont = None
+
+from teleprompta_config import SETTINGS_FILE, DEFAULT_BG_COLOR, load_settings
+
+DEFAULT_WIDTH = 900
+DEFAULT_HEIGHT = 600
+DEFAULT_SCROLL_SPEED = 2.0
+DEFAULT_CHUNK = 16
+TEXT_PADDING = 3
+POINTS_TO_PIXELS = 96 / 72
+FALLBACK_FONTS = [
+    ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf"),
+    ("LiberationSans-Regular.ttf", "LiberationSans-Bold.ttf"),
+]
+
+# Windows file names that can't be derived from the family name: (regular, bold).
+KNOWN_FONT_FILES = {
+    "Arial": ("arial.ttf", "arialbd.ttf"),
+    "Arial Black": ("ariblk.ttf", "ariblk.ttf"),
+}
+HEAVY_WEIGHTS = ("black", "heavy", "bold")
+
+_fonts = {}
+_unresolved = set()
+_worker = {}
+
+def read_script(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("text", ""), data.get("tags", {})
+
+def _index_to_offset(index, line_starts, text_len):
+    line, col = index.split(".")
+    line = int(line) - 1
+    if line >= len(line_starts):
+        return text_len
+    return min(line_starts[line] + int(col), text_len)
+
+def char_styles(text, tags, style_count):
+    # Mirrors the Tk tag priority of the editor: "body" first, then style2, style3, ...
+    line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    styles = [0] * len(text)
+    names = ["body"] + [f"style{i+1}" for i in range(1, style_count)]
+    for idx, name in enumerate(names):
+        for start, end in tags.get(name, []):
+            a = _index_to_offset(start, line_starts, len(text))
+            b = _index_to_offset(end, line_starts, len(text))
+            styles[a:b] = [idx] * max(b - a, 0)
+    return styles
+
+def _font_candidates(family, bold):
+    base = family.replace(" ", "")
+    underscored = family.replace(" ", "_")
+    known = KNOWN_FONT_FILES.get(family)
+    if bold:
+        names = [known[1]] if known else []
+        names += [f"{base}-Bold.ttf", f"{base}bd.ttf", f"{base.lower()}bd.ttf",
+                  f"{family} Bold.ttf", f"{underscored}_Bold.ttf"]
+    else:
+        names = [known[0]] if known else []
+        names += [f"{base}.ttf", f"{base}-Regular.ttf", f"{family}.ttf",
+                  f"{base.lower()}.ttf", f"{underscored}.ttf"]
+    return names
+
+def get_font(style, idx, font_dir=None):
+    bold = idx > 0
+    key = (style["font"], style["size"], bold, font_dir)
+    if key in _fonts:
+        return _fonts[key]
+    family = style["font"]
+    # A regular file only satisfies a bold style when the family itself is a heavy face (e.g. Arial Black).
+    heavy = any(w in family.lower() for w in HEAVY_WEIGHTS)
+    groups = [(_font_candidates(family, True), True)] if bold else []
+    groups.append((_font_candidates(family, False), not bold or heavy))
+    if font_dir:
+        groups = [([os.path.join(font_dir, n) for n in names] + names, exact) for names, exact in groups]
+    groups.append(([bold_name if bold else name for name, bold_name in FALLBACK_FONTS], False))
+    size = round(style["size"] * POINTS_TO_PIXELS)
+    fnt = None
+    exact = False
+    for names, group_exact in groups:
+        for name in names:
+            try:
+                fnt = ImageFont.truetype(name, size)
+                exact = group_exact
+                break
+            except OSError:
+                continue
+        if fnt is not None:
+            break
+    if not exact:
+        _unresolved.add((family, bold))
+    if fnt is None:
+        try:
+            fnt = ImageFont.load_default(size)
+        except TypeError:
+            fnt = ImageFont.load_default()
+    _fonts[key] = fnt
+    return fnt
+
+def layout_text(text, tags, styles, width, font_dir=None):
+    per_char = char_styles(text, tags, len(styles))
+    fonts = [get_font(style, idx, font_dir) for idx, style in enumerate(styles)]
+    avail = width - 2 * TEXT_PADDING
+    lines = []
+    y = TEXT_PADDING
+    offset = 0
+
+    def flush(pieces, fallback_style):
+        nonlocal y
+        used = {s for _, _, s in pieces} or {fallback_style}
+        ascent = max(fonts[s].getmetrics()[0] for s in used)
+        descent = max(fonts[s].getmetrics()[1] for s in used)
+        runs = []
+        for x, chunk, s in pieces:
+            if runs and runs[-1][2] == s and not chunk.isspace():
+                px, ptext, _ = runs[-1]
+                runs[-1] = (px, ptext + chunk, s)
+            else:
+                runs.append((x, chunk, s))
+        lines.append((y, ascent + descent, ascent, runs))
+        y += ascent + descent
+
+    for logical in text.split("\n"):
+        fallback = per_char[offset] if offset < len(per_char) else 0
+        pieces = []
+        x = 0
+        for m in re.finditer(r"\S+|\s+", logical):
+            token = []
+            pos = m.start()
+            for s, group in groupby(per_char[offset + m.start():offset + m.end()]):
+                n = len(list(group))
+                token.append((logical[pos:pos + n], s))
+                pos += n
+            token_width = sum(fonts[s].getlength(chunk) for chunk, s in token)
+            if pieces and x + token_width > avail and not m.group().isspace():
+                flush(pieces, fallback)
+                pieces = []
+                x = 0
+            if token_width > avail and not m.group().isspace():
+                # Like Tk's wrap="word", fall back to breaking a too-long word by character.
+                token = [(c, s) for chunk, s in token for c in chunk]
+                for c, s in token:
+                    w = fonts[s].getlength(c)
+                    if pieces and x + w > avail:
+                        flush(pieces, fallback)
+                        pieces = []
+                        x = 0
+                    pieces.append((x, c, s))
+                    x += w
+                continue
+            for chunk, s in token:
+                pieces.append((x, chunk, s))
+                x += fonts[s].getlength(chunk)
+        flush(pieces, fallback)
+        offset += len(logical) + 1
+    return lines, y + TEXT_PADDING
+
+def count_frames(content_height, speed):
+    return int(math.ceil(content_height / speed)) + 1
+
+def _init_worker(lines, styles, bg_color, width, height, speed, font_dir, out_dir):
+    _worker.clear()
+    _worker.update(
+        lines=lines, tops=[line[0] for line in lines], styles=styles, bg=bg_color,
+        width=width, height=height, speed=speed, font_dir=font_dir, out_dir=out_dir,
+        cache={},
+    )
+
+def _line_raster(i):
+    cache = _worker["cache"]
+    if i not in cache:
+        _, line_height, ascent, runs = _worker["lines"][i]
+        line_width = max((x + get_font(_worker["styles"][s], s, _worker["font_dir"]).getlength(chunk)
+                          for x, chunk, s in runs), default=1)
+        raster = Image.new("RGBA", (max(int(math.ceil(line_width)), 1), max(line_height, 1)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(raster)
+        for x, chunk, s in runs:
+            if chunk.isspace():
+                continue
+            style = _worker["styles"][s]
+            fnt = get_font(style, s, _worker["font_dir"])
+            draw.text((x, ascent - fnt.getmetrics()[0]), chunk, font=fnt, fill=style["color"])
+        cache[i] = raster
+    return cache[i]
+
+def render_frame(n):
+    width, height = _worker["width"], _worker["height"]
+    top = int(round(n * _worker["speed"]))
+    lines, tops, cache = _worker["lines"], _worker["tops"], _worker["cache"]
+    frame = Image.new("RGB", (width, height), _worker["bg"])
+    first = max(bisect.bisect_right(tops, top) - 1, 0)
+    last = bisect.bisect_left(tops, top + height)
+    for i in range(first, last):
+        raster = _line_raster(i)
+        frame.paste(raster, (TEXT_PADDING, lines[i][0] - top), raster)
+    for i in [k for k in cache if k < first]:
+        del cache[i]
+    return frame
+
+def render_range(start, stop):
+    if _worker["out_dir"] is None:
+        return b"".join(render_frame(n).tobytes() for n in range(start, stop))
+    for n in range(start, stop):
+        render_frame(n).save(os.path.join(_worker["out_dir"], f"frame_{n:05d}.png"))
+    return b""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Teleprompta scroll playback to frames without a display.")
+    parser.add_argument("script", help="Teleprompter script (.teleprompt)")
+    parser.add_argument("--settings", help=f"Settings file with styles, bg_color and scroll_speed (default: {SETTINGS_FILE})")
+    parser.add_argument("--out", help="Directory for the PNG frame sequence")
+    parser.add_argument("--raw", help="Write raw RGB24 frames to this file, or '-' for stdout (e.g. piped into ffmpeg)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("--speed", type=float, help="Pixels scrolled per frame (defaults to scroll_speed from settings)")
+    parser.add_argument("--frames", type=int, help="Number of frames (defaults to scrolling the whole script off screen)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes rendering frame ranges")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Frames per process task")
+    parser.add_argument("--font-dir", help="Extra directory searched for .ttf files")
+    args = parser.parse_args(argv)
+    if Image is None:
+        parser.error("Pillow is required for rendering (pip install Pillow)")
+    if bool(args.out) == bool(args.raw):
+        parser.error("choose exactly one of --out or --raw")
+    if args.settings is not None:
+        try:
+            with open(args.settings, "r", encoding="utf-8") as f:
+                json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not read settings.\n{e}")
+    settings = load_settings(args.settings or SETTINGS_FILE)
+    speed = args.speed
+    if speed is None:
+        try:
+            speed = float(settings.get("scroll_speed", DEFAULT_SCROLL_SPEED))
+        except (TypeError, ValueError):
+            parser.error(f"Invalid scroll_speed in settings: {settings.get('scroll_speed')!r}")
+    if not math.isfinite(speed) or speed <= 0:
+        parser.error("scroll speed must be positive")
+    try:
+        text, tags = read_script(args.script)
+    except Exception as e:
+        parser.error(f"Could not open script.\n{e}")
+    styles = settings["styles"]
+    bg_color = settings.get("bg_color", DEFAULT_BG_COLOR)
+    lines, content_height = layout_text(text, tags, styles, args.width, args.font_dir)
+    for idx, style in enumerate(styles):
+        if (style["font"], idx > 0) in _unresolved:
+            face = "bold font" if idx > 0 else "font"
+            print(f"Warning: {face} '{style['font']}' for style '{style['name']}' not found, using a fallback font",
+                  file=sys.stderr)
+    total = args.frames if args.frames is not None else count_frames(content_height, speed)
+    if total <= 0:
+        return
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    chunk = max(args.chunk, 1)
+    workers = max(args.workers or 1, 1)
+    ranges = iter([(s, min(s + chunk, total)) for s in range(0, total, chunk)])
+    init_args = (lines, styles, bg_color, args.width, args.height, speed, args.font_dir, args.out)
+    to_stdout = args.raw == "-"
+    raw = None
+    if args.raw:
+        raw = sys.stdout.buffer if to_stdout else open(args.raw, "wb")
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            pending = deque(pool.submit(render_range, *r) for r in islice(ranges, 2 * workers))
+            while pending:
+                data = pending.popleft().result()
+                if raw:
+                    try:
+                        raw.write(data)
+                    except BrokenPipeError:
+                        # The reader (e.g. ffmpeg) exited early; stop without a traceback.
+                        for future in pending:
+                            future.cancel()
+                        if to_stdout:
+                            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                        return
+                for r in islice(ranges, 1):
+                    pending.append(pool.submit(render_range, *r))
+    finally:
+        if raw and not to_stdout:
+            raw.close()
+    elapsed = time.perf_counter() - started
+    print(f"Rendered {total} frames ({args.width}x{args.height}) in {elapsed:.2f}s, "
+          f"{total / elapsed if elapsed else 0:.1f} frames/sec", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import shutil
+
+import pytest
+
+import teleprompta_render as render
+
+STYLES = [
+    {"name": "Body", "font": "Arial", "size": 20, "color": "#FFFFFF"},
+    {"name": "Title", "font": "Arial Black", "size": 28, "color": "#FF9800"},
+    {"name": "Tips", "font": "Arial", "size": 14, "color": "#AAAAAA"},
+]
+
+def test_index_to_offset():
+    text = "ab\ncde\n\nf"
+    line_starts = [0, 3, 7, 8]
+    assert render._index_to_offset("1.0", line_starts, len(text)) == 0
+    assert render._index_to_offset("2.1", line_starts, len(text)) == 4
+    assert render._index_to_offset("4.0", line_starts, len(text)) == 8
+    assert render._index_to_offset("9.0", line_starts, len(text)) == len(text)
+    assert render._index_to_offset("4.50", line_starts, len(text)) == len(text)
+
+def test_char_styles_later_tags_override_body():
+    text = "Title\nbody tip"
+    tags = {
+        "style3": [["2.5", "2.8"]],
+        "body": [["1.0", "3.0"]],
+        "style2": [["1.0", "2.0"]],
+    }
+    styles = render.char_styles(text, tags, len(STYLES))
+    assert styles[:6] == [1] * 6
+    assert styles[6:11] == [0] * 5
+    assert styles[11:] == [2] * 3
+
+def test_char_styles_ignores_unknown_tags():
+    styles = render.char_styles("abc", {"sel": [["1.0", "1.3"]], "style9": [["1.0", "1.3"]]}, len(STYLES))
+    assert styles == [0, 0, 0]
+
+def test_count_frames():
+    assert render.count_frames(100, 2.0) == 51
+    assert render.count_frames(101, 2.0) == 52
+    assert render.count_frames(10, 0.5) == 21
+
+def test_layout_text_wraps_at_width():
+    pytest.importorskip("PIL")
+    width = 200
+    lines, height = render.layout_text("one two three four five six seven eight nine ten", {}, STYLES, width)
+    assert len(lines) > 1
+    assert height == lines[-1][0] + lines[-1][1] + render.TEXT_PADDING
+    fnt = render.get_font(STYLES[0], 0)
+    for _, _, _, runs in lines:
+        right = max(x + fnt.getlength(chunk) for x, chunk, _ in runs if not chunk.isspace())
+        assert right <= width - 2 * render.TEXT_PADDING
+    words = " ".join("".join(chunk for _, chunk, _ in runs).strip() for _, _, _, runs in lines)
+    assert words == "one two three four five six seven eight nine ten"
+
+def test_layout_text_breaks_long_word_by_character():
+    pytest.importorskip("PIL")
+    width = 120
+    lines, _ = render.layout_text("W" * 40, {}, STYLES, width)
+    assert len(lines) > 1
+    assert "".join(c for _, _, _, runs in lines for _, c, _ in runs) == "W" * 40
+
+@pytest.fixture
+def dejavu():
+    ImageFont = pytest.importorskip("PIL.ImageFont")
+    try:
+        regular = ImageFont.truetype("DejaVuSans.ttf", 10).path
+        bold = ImageFont.truetype("DejaVuSans-Bold.ttf", 10).path
+    except OSError:
+        pytest.skip("DejaVu fonts not installed")
+    render._fonts.clear()
+    render._unresolved.clear()
+    yield regular, bold
+    render._fonts.clear()
+    render._unresolved.clear()
+
+def _style(family):
+    return {"name": family, "font": family, "size": 20, "color": "#FFFFFF"}
+
+def test_get_font_resolves_windows_arial_files(dejavu, tmp_path):
+    regular, bold = dejavu
+    shutil.copy(regular, tmp_path / "arial.ttf")
+    shutil.copy(bold, tmp_path / "arialbd.ttf")
+    shutil.copy(bold, tmp_path / "ariblk.ttf")
+    font_dir = str(tmp_path)
+    assert render.get_font(_style("Arial"), 0, font_dir).path.endswith("arial.ttf")
+    assert render.get_font(_style("Arial"), 1, font_dir).path.endswith("arialbd.ttf")
+    assert render.get_font(_style("Arial Black"), 0, font_dir).path.endswith("ariblk.ttf")
+    assert render.get_font(_style("Arial Black"), 1, font_dir).path.endswith("ariblk.ttf")
+    assert render._unresolved == set()
+
+def test_get_font_flags_bold_style_on_regular_file(dejavu, tmp_path):
+    regular, _ = dejavu
+    shutil.copy(regular, tmp_path / "TelepromptaTest.ttf")
+    fnt = render.get_font(_style("Teleprompta Test"), 1, str(tmp_path))
+    assert fnt.path.endswith("TelepromptaTest.ttf")
+    assert render._unresolved == {("Teleprompta Test", True)}
+
+def test_get_font_fallback_only_for_real_misses(dejavu):
+    _, bold = dejavu
+    render.get_font(_style("DejaVu Sans"), 0)
+    render.get_font(_style("DejaVu Sans"), 1)
+    assert render._unresolved == set()
+    fnt = render.get_font(_style("No Such Font"), 1)
+    assert fnt.path == bold
+    assert render._unresolved == {("No Such Font", True)}